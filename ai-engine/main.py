@@ -1,16 +1,19 @@
 import os
 import re
+import io
+import csv
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+from numba import njit, prange
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from pymongo import ASCENDING, MongoClient
 from tqdm.auto import tqdm
-from sklearn.linear_model import LinearRegression
 from flask import Flask, jsonify
-import threading
-
-import spacy
-from spacy.matcher import PhraseMatcher
+import multiprocessing
 
 # -------------------------------
 # 1) CONFIG & DB
@@ -21,7 +24,8 @@ def connect_db():
     if not MONGO_URI:
         print("❌ MONGO_URI not found. Make sure an .env file exists in ai-engine.")
         raise SystemExit(1)
-    client = MongoClient(MONGO_URI)
+    # Trend/forecast payloads are highly repetitive; let the server pick a wire compressor.
+    client = MongoClient(MONGO_URI, compressors='zstd,snappy,zlib', zlibCompressionLevel=6)
     db = client.skill_evolution
     print("✅ Database connection successful.")
     return db
@@ -29,80 +33,194 @@ def connect_db():
 # -------------------------------
 # 2) HELPERS
 # -------------------------------
-def extract_skills_batch(texts, nlp_model, matcher_tool, batch_size=512, n_process=1):
-    """Batch skill extraction using spaCy nlp.pipe() with progress bar."""
-    skills_list = []
-    for doc in tqdm(nlp_model.pipe(texts, batch_size=batch_size, n_process=n_process),
-                    total=len(texts), desc="Extracting skills"):
-        matches = matcher_tool(doc)
-        skills = {doc[start:end].text.lower() for _, start, end in matches}
-        skills_list.append(list(skills))
-    return skills_list
-
-def save_to_db_bulk(collection, doc_id, data_key, data, chunk_size=1000):
-    """Save large arrays to MongoDB with progress bar safely."""
+# Runs of HTML tags and whitespace collapse to a single space in one pass.
+_CLEAN = re.compile(r"(?:<[^>]*>|\s)+")
+
+# Each posting's skills are stored as a uint32 bitmask: bit i means SKILL_LIST[i].
+SKILL_LIST = [
+    'python', 'r', 'sql', 'java', 'scala', 'javascript', 'html', 'css',
+    'tableau', 'power bi', 'sas', 'excel', 'hadoop', 'spark', 'aws', 'azure', 'gcp',
+    'tensorflow', 'pytorch', 'scikit-learn', 'docker', 'kubernetes',
+    'react', 'mongodb', 'vue', 'angular', 'typescript'
+]
+SKILL_BITS = {skill: 1 << i for i, skill in enumerate(SKILL_LIST)}
+# Longest skills first so e.g. 'javascript' wins over 'java' in the alternation.
+# '&' counts as part of a word, as in spaCy's tokenizer, so 'r&d' is not the skill 'r'.
+SKILL_PATTERN = re.compile(
+    r'(?<![\w&])(' + '|'.join(map(re.escape, sorted(SKILL_LIST, key=len, reverse=True))) + r')(?![\w&])'
+)
+
+def extract_skills_batch(texts, skill_pattern, batch_size=10000):
+    """Batch skill extraction into per-text skill bitmasks, with a per-batch progress bar."""
+    masks = []
+    with tqdm(total=len(texts), desc="Extracting skills") as progress:
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start+batch_size]
+            for text in batch:
+                mask = 0
+                for skill in skill_pattern.findall(text):
+                    mask |= SKILL_BITS[skill]
+                masks.append(mask)
+            progress.update(len(batch))
+    return np.array(masks, dtype=np.uint32)
+
+def save_to_db_bulk(collection, doc_id, data_key, data, last_updated):
+    """Save each item as its own document in `<collection>_items`, plus a summary doc."""
     print(f"\n--- Saving {data_key} to database ---")
     try:
-        now = pd.Timestamp.now()
+        items_collection = collection.database[f"{collection.name}_items"]
+        items_collection.create_index([('parent_id', ASCENDING), ('skill', ASCENDING)])
+        items_collection.delete_many({'parent_id': doc_id})
+        if data:
+            items_collection.insert_many([{'parent_id': doc_id, **item} for item in data], ordered=False)
         collection.update_one(
             {'_id': doc_id},
-            {'$set': {data_key: [], 'last_updated': now}},
+            {'$set': {'last_updated': last_updated, 'count': len(data)},
+             '$unset': {data_key: ''}},
             upsert=True
         )
-        for i in tqdm(range(0, len(data), chunk_size), desc=f"Saving {data_key}"):
-            chunk = data[i:i+chunk_size]
-            collection.update_one(
-                {'_id': doc_id},
-                {'$push': {data_key: {'$each': chunk}}, '$set': {'last_updated': pd.Timestamp.now()}},
-                upsert=True
-            )
         print(f"✅ {data_key.capitalize()} saved successfully to MongoDB!")
     except Exception as e:
         print(f"❌ Could not save {data_key} to MongoDB. Error: {e}")
 
+def count_skills_by_year(masks, year_col):
+    """Count (skill, year) occurrences from skill bitmasks, one bincount per skill."""
+    year_codes, years = pd.factorize(year_col)
+    n_years = len(years)
+    counts = np.empty((len(SKILL_LIST), n_years), dtype=np.int64)
+    for i in range(len(SKILL_LIST)):
+        counts[i] = np.bincount(year_codes[(masks >> i) & 1 == 1], minlength=n_years)
+
+    skill_idx, year_idx = np.nonzero(counts)
+    return pd.DataFrame({
+        'skills': np.asarray(SKILL_LIST, dtype=object)[skill_idx],
+        'year': np.asarray(years)[year_idx],
+        'demand_score': counts[skill_idx, year_idx],
+    })
+
+@njit(parallel=True, cache=True)
+def fit_forecast(starts, years, demand, out_pred):
+    """Closed-form OLS of demand on year per skill segment, forecasting the next years.
+
+    Rows must be sorted by skill, then year; skill g spans starts[g]:starts[g + 1].
+    out_pred[g, h] receives the prediction for the segment's latest year + h + 1.
+    """
+    k = len(starts) - 1
+    horizon = out_pred.shape[1]
+    for g in prange(k):
+        lo, hi = starts[g], starts[g + 1]
+        n = hi - lo
+        sx = 0.0
+        sxx = 0.0
+        sy = 0.0
+        sxy = 0.0
+        for i in range(lo, hi):
+            sx += years[i]
+            sxx += years[i] * years[i]
+            sy += demand[i]
+            sxy += years[i] * demand[i]
+
+        denom = n * sxx - sx * sx
+        slope = (n * sxy - sx * sy) / denom if denom != 0 else 0.0
+        intercept = (sy - slope * sx) / n if n > 0 else 0.0
+        latest_year = years[hi - 1] if n > 0 else 0.0
+        for h in range(horizon):
+            out_pred[g, h] = intercept + slope * (latest_year + h + 1)
+
+# Multiline descriptions are common; rows with the wrong number of fields are skipped.
+_CSV_PARSE_OPTIONS = pv.ParseOptions(newlines_in_values=True,
+                                     invalid_row_handler=lambda row: 'skip')
+
+def read_csv_header(file_path):
+    """Return a CSV's column names without parsing the whole file."""
+    return pv.open_csv(file_path, parse_options=_CSV_PARSE_OPTIONS).schema.names
+
+def read_csv_columns(file_path, columns):
+    """Parse only the given columns of a CSV, as nullable strings."""
+    short_rows = []
+
+    def skip_invalid_row(row):
+        if row.actual_columns < row.expected_columns:
+            short_rows.append(row.text)
+        return 'skip'
+
+    parse_options = pv.ParseOptions(newlines_in_values=True, invalid_row_handler=skip_invalid_row)
+    convert_options = pv.ConvertOptions(
+        include_columns=columns,
+        column_types={col: pa.string() for col in columns},
+        strings_can_be_null=True,
+    )
+    df = pv.read_csv(file_path, parse_options=parse_options, convert_options=convert_options).to_pandas()
+    if short_rows:
+        # pyarrow can only drop short rows; pad them with NaN like pandas does, reusing
+        # the raw row text the handler captured instead of reparsing the whole file.
+        header = read_csv_header(file_path)
+        positions = [header.index(col) for col in columns]
+        padded = []
+        for fields in csv.reader(io.StringIO('\n'.join(short_rows))):
+            padded.append([(fields[i] or None) if i < len(fields) else None for i in positions])
+        df = pd.concat([df, pd.DataFrame(padded, columns=columns, dtype=df.dtypes.iloc[0])],
+                       ignore_index=True)
+    return df
+
+def _load_one(file_path):
+    """Load one historical CSV as a ['year', 'Job Description'] frame, or None to skip it."""
+    filename = os.path.basename(file_path)
+    year_match = re.search(r'_(\d{4})\.csv', filename)
+    year = int(year_match.group(1)) if year_match else None
+    print(f"-> Processing {filename} for year {year}...")
+
+    columns = read_csv_header(file_path)
+
+    # StackOverflow dataset handling
+    stack_cols = ['LanguageWorkedWith', 'LanguageDesireNextYear', 'DatabaseWorkedWith', 'DatabaseDesireNextYear']
+    stack_cols = [col for col in stack_cols if col in columns]
+    if stack_cols:
+        df = read_csv_columns(file_path, stack_cols)
+        df['Job Description'] = df[stack_cols[0]].fillna('').str.cat(
+            [df[col].fillna('') for col in stack_cols[1:]], sep=' ')
+        df['year'] = np.int16(year or 2023)
+        return df[['year', 'Job Description']]
+
+    # Traditional job datasets
+    desc_col = next((col for col in ['description', 'Job Description', 'Job_Description']
+                     if col in columns), None)
+    if desc_col:
+        df = read_csv_columns(file_path, [desc_col])
+    elif 'job_skills' in columns:
+        if 'job_type_skills' in columns:
+            df = read_csv_columns(file_path, ['job_skills', 'job_type_skills'])
+            df['merged_skills'] = df['job_skills'].fillna('').str.cat(df['job_type_skills'].fillna(''), sep=' ')
+            desc_col = 'merged_skills'
+        else:
+            df = read_csv_columns(file_path, ['job_skills'])
+            desc_col = 'job_skills'
+
+    if not desc_col:
+        print(f"⚠️ Skipping {filename}: No valid description/skills column found.")
+        return None
+
+    df.rename(columns={desc_col: 'Job Description'}, inplace=True)
+    df['year'] = np.int16(year or 0)
+    return df[['year', 'Job Description']]
+
 def load_historical_frames(historical_data_path):
     print("\n--- Loading historical datasets ---")
-    all_dataframes = []
     if not os.path.isdir(historical_data_path):
         print(f"❌ Error: Directory not found at {historical_data_path}")
         raise SystemExit(1)
 
-    for filename in tqdm(os.listdir(historical_data_path), desc="Loading files"):
-        if not filename.endswith('.csv'):
-            continue
-
-        year_match = re.search(r'_(\d{4})\.csv', filename)
-        year = int(year_match.group(1)) if year_match else None
-        file_path = os.path.join(historical_data_path, filename)
-        print(f"-> Processing {filename} for year {year}...")
-
-        df = pd.read_csv(file_path, engine='python', on_bad_lines='skip')
-
-        # StackOverflow dataset handling
-        stack_cols = ['LanguageWorkedWith', 'LanguageDesireNextYear', 'DatabaseWorkedWith', 'DatabaseDesireNextYear']
-        if any(col in df.columns for col in stack_cols):
-            df['Job Description'] = df[stack_cols].fillna('').agg(' '.join, axis=1)
-            df['year'] = year or 2023
-            all_dataframes.append(df[['year', 'Job Description']])
-            continue
-
-        # Traditional job datasets
-        desc_col = next((col for col in ['description', 'Job Description', 'Job_Description']
-                         if col in df.columns), None)
-        if not desc_col and 'job_skills' in df.columns:
-            if 'job_type_skills' in df.columns:
-                df['merged_skills'] = df['job_skills'].fillna('') + ' ' + df['job_type_skills'].fillna('')
-                desc_col = 'merged_skills'
-            else:
-                desc_col = 'job_skills'
-
-        if not desc_col:
-            print(f"⚠️ Skipping {filename}: No valid description/skills column found.")
-            continue
-
-        df.rename(columns={desc_col: 'Job Description'}, inplace=True)
-        df['year'] = year or 0
-        all_dataframes.append(df[['year', 'Job Description']])
+    csv_paths = [os.path.join(historical_data_path, filename)
+                 for filename in os.listdir(historical_data_path) if filename.endswith('.csv')]
+
+    # Files are parsed independently, so spread them across processes. There are usually
+    # only a few files, and fork starts every worker up front, so don't exceed that.
+    max_workers = max(1, min(len(csv_paths), os.cpu_count() or 1))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_load_one, path) for path in csv_paths]
+        for _ in tqdm(as_completed(futures), total=len(futures), desc="Loading files"):
+            pass
+    all_dataframes = [df for df in (future.result() for future in futures) if df is not None]
 
     if not all_dataframes:
         print("❌ No valid CSV files found. Exiting.")
@@ -112,19 +230,6 @@ def load_historical_frames(historical_data_path):
     print(f"✅ Loaded and combined {len(combined_df)} total job postings.")
     return combined_df
 
-def build_matcher():
-    nlp = spacy.blank("en")
-    matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
-    SKILL_LIST = [
-        'python', 'r', 'sql', 'java', 'scala', 'javascript', 'html', 'css',
-        'tableau', 'power bi', 'sas', 'excel', 'hadoop', 'spark', 'aws', 'azure', 'gcp',
-        'tensorflow', 'pytorch', 'scikit-learn', 'docker', 'kubernetes',
-        'react', 'mongodb', 'vue', 'angular', 'typescript'
-    ]
-    patterns = [nlp.make_doc(skill) for skill in SKILL_LIST]
-    matcher.add("SKILL_MATCHER", patterns)
-    return nlp, matcher
-
 # -------------------------------
 # 3) MAIN PIPELINE
 # -------------------------------
@@ -135,68 +240,63 @@ def main():
     forecasts_collection = db.forecasts
 
     historical_data_path = os.path.join('data', 'historical')
-    combined_df = load_historical_frames(historical_data_path)
-
-    df_processed = combined_df.copy()
+    df_processed = load_historical_frames(historical_data_path)
     df_processed.dropna(subset=['Job Description'], inplace=True)
 
-    df_processed['Job Description'] = (
-        df_processed['Job Description']
-        .astype(str)
-        .str.replace(r"<[^>]*>", " ", regex=True)
-        .str.replace(r"\s+", " ", regex=True)
-        .str.lower()
-        .str.strip()
-    )
-
-    nlp, matcher = build_matcher()
-    is_windows = (os.name == 'nt')
-    cpu_count = os.cpu_count() or 2
-    n_process = 1 if is_windows else max(1, cpu_count - 1)
-    batch_size = 512
+    df_processed['Job Description'] = [
+        _CLEAN.sub(' ', text).lower().strip()
+        for text in df_processed['Job Description'].astype(str)
+    ]
 
-    texts = df_processed['Job Description'].tolist()
-    df_processed['skills'] = extract_skills_batch(texts, nlp, matcher,
-                                                  batch_size=batch_size,
-                                                  n_process=n_process)
+    # Templated postings repeat verbatim, so scan each distinct text only once.
+    text_codes, unique_texts = pd.factorize(df_processed['Job Description'])
+    df_processed['skills'] = extract_skills_batch(unique_texts, SKILL_PATTERN)[text_codes]
     print("✅ Skill extraction complete.")
 
     print("\n--- Calculating and Forecasting Skill Trends ---")
-    skills_by_year = df_processed.explode('skills').dropna(subset=['skills'])
-    yearly_skill_counts = skills_by_year.groupby(['skills', 'year']).size().reset_index(name='demand_score')
-
+    yearly_skill_counts = count_skills_by_year(df_processed['skills'].to_numpy(),
+                                               df_processed['year'])
+
+    # Sort once, then sweep each skill's contiguous slice instead of grouping.
+    yearly_skill_counts = yearly_skill_counts.sort_values(['skills', 'year'], ignore_index=True)
+    codes, skill_names = pd.factorize(yearly_skill_counts['skills'])
+    k = len(skill_names)
+    years = yearly_skill_counts['year'].to_numpy(dtype=np.int64)
+    demand = yearly_skill_counts['demand_score'].to_numpy(dtype=np.int64)
+
+    starts = np.searchsorted(codes, np.arange(k + 1))
+    n = np.diff(starts)
+    predicted_scores = np.empty((k, 3))
+    fit_forecast(starts, years.astype(np.float64), demand.astype(np.float64), predicted_scores)
+    future_years = years[starts[1:] - 1][:, None] + np.arange(1, 4)[None, :]
+    predicted_scores = np.round(np.maximum(predicted_scores, 0)).astype(np.int64)
+
+    # History is stored as compact [year, demand_score] pairs.
+    history_points = np.column_stack((years, demand))
     historical_trends = []
     forecasted_skills = []
 
-    for skill_name, group in tqdm(yearly_skill_counts.groupby('skills'), desc="Forecasting trends"):
-        group = group.sort_values('year')
-        history = group.to_dict('records')
-
-        if len(history) > 1:
-            X = np.array([h['year'] for h in history]).reshape(-1, 1)
-            y = np.array([h['demand_score'] for h in history])
-            model = LinearRegression().fit(X, y)
-            latest_year = history[-1]['year']
-            future_years = np.array([latest_year + i for i in range(1, 4)]).reshape(-1, 1)
-            predicted_scores = model.predict(future_years)
+    for code in tqdm(range(k), desc="Forecasting trends"):
+        skill_name = skill_names[code]
+        lo, hi = starts[code], starts[code + 1]
+        history = history_points[lo:hi].tolist()
+
+        if n[code] > 1:
             forecast = [
-                {'year': int(year[0]), 'demand_score': round(max(0, score))}
-                for year, score in zip(future_years, predicted_scores)
+                {'year': year, 'demand_score': score}
+                for year, score in zip(future_years[code].tolist(), predicted_scores[code].tolist())
             ]
             forecasted_skills.append({'skill': skill_name, 'forecast': forecast})
 
         historical_trends.append({'skill': skill_name, 'history': history})
 
-    save_to_db_bulk(trends_collection, 'skill_historical_trends', 'trends', historical_trends)
-    save_to_db_bulk(forecasts_collection, 'skill_forecasts', 'forecasts', forecasted_skills)
+    now = datetime.now(timezone.utc)
+    save_to_db_bulk(trends_collection, 'skill_historical_trends', 'trends', historical_trends, now)
+    save_to_db_bulk(forecasts_collection, 'skill_forecasts', 'forecasts', forecasted_skills, now)
 
 # -------------------------------
 # ENTRYPOINT
 # -------------------------------
-if __name__ == "__main__":
-    main()
-
-
 app = Flask(__name__)
 
 @app.route('/health', methods=['GET'])
@@ -208,7 +308,8 @@ def run_pipeline():
     main()
 
 if __name__ == "__main__":
-    # Start the data processing in a separate thread so the web server can start immediately
-    threading.Thread(target=run_pipeline).start()
+    # Run the CPU-bound pipeline in its own process (and GIL) so /health stays responsive.
+    # It is not a daemon because it starts its own worker processes while loading CSVs.
+    multiprocessing.Process(target=run_pipeline, daemon=False).start()
     # Start the Flask server
     app.run(host='0.0.0.0', port=os.getenv("PORT", 5001))
\ No newline at end of file
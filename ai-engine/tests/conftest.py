@@ -0,0 +1,5 @@
+import os
+import sys
+
+# main.py lives in ai-engine/, which is not a package; make it importable from any cwd.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,51 @@
+from main import SKILL_BITS, SKILL_PATTERN, extract_skills_batch, read_csv_columns
+
+
+def test_ampersand_words_are_not_skills():
+    masks = extract_skills_batch(['r&d team'], SKILL_PATTERN)
+    assert masks.tolist() == [0]
+
+
+def test_slash_separated_skills_are_both_matched():
+    masks = extract_skills_batch(['r/python'], SKILL_PATTERN)
+    assert masks.tolist() == [SKILL_BITS['r'] | SKILL_BITS['python']]
+
+
+# The regex scan deliberately differs from the old spaCy PhraseMatcher on these inputs,
+# which spaCy kept as single tokens; each now counts towards the listed skills.
+def test_regex_matches_where_spacy_tokens_did_not():
+    cases = {
+        'python;sql': {'python', 'sql'},
+        'vue.js': {'vue'},
+        'react.js': {'react'},
+        'python and r. we': {'python', 'r'},
+        'a.r': {'r'},
+    }
+    masks = extract_skills_batch(list(cases), SKILL_PATTERN)
+    for mask, expected in zip(masks.tolist(), cases.values()):
+        assert mask == sum(SKILL_BITS[skill] for skill in expected)
+
+
+def test_short_csv_rows_are_kept(tmp_path):
+    csv_path = tmp_path / 'jobs_2022.csv'
+    csv_path.write_text('id,description,other\n1,python developer,x\n2,short row sql\n'
+                        '3,"multi\nline r"\n4,\n')
+    df = read_csv_columns(str(csv_path), ['description'])
+    assert df['description'].tolist()[:3] == ['python developer', 'short row sql', 'multi\nline r']
+    assert df['description'].isna().tolist() == [False, False, False, True]
+
+
+def test_long_csv_rows_are_skipped_alongside_short_rows(tmp_path):
+    csv_path = tmp_path / 'jobs_2022.csv'
+    csv_path.write_text('id,description,other\n1,python developer,x\n2,too,many,fields\n3,short row sql\n')
+    df = read_csv_columns(str(csv_path), ['description'])
+    assert df['description'].tolist() == ['python developer', 'short row sql']
+
+
+def test_short_csv_rows_pad_every_missing_column(tmp_path):
+    csv_path = tmp_path / 'jobs_2022.csv'
+    csv_path.write_text('id,description,other,extra\n1,python developer,x,y\n2,java,z\n3,sql\n')
+    df = read_csv_columns(str(csv_path), ['description', 'other'])
+    assert df['description'].tolist() == ['python developer', 'java', 'sql']
+    assert df['other'].tolist()[:2] == ['x', 'z']
+    assert df['other'].isna().tolist() == [False, False, True]
@@ -1,5 +1,5 @@
 const User = require('../models/User');
-const Trend = require('../models/Trend');
+const TrendItem = require('../models/TrendItem');
 const resourceMap = require('../data/resourceMap');
 const careerPaths = require('../data/careerPaths');
 const SKILL_PREREQUISITES = require('../data/skillPrerequisites');
@@ -27,10 +27,10 @@ exports.getMarketRecommendations = async (req, res) => {
     const requiredSkills = careerPaths[careerInterest];
     if (!requiredSkills) return res.status(404).json({ msg: 'Career path not found.' });
 
-    const trendsData = await Trend.findById('skill_historical_trends');
-    if (!trendsData) return res.status(404).json({ msg: 'Trend data not found.' });
+    const trendItems = await TrendItem.find({ parent_id: 'skill_historical_trends' });
+    if (!trendItems.length) return res.status(404).json({ msg: 'Trend data not found.' });
 
-    const trendsMap = new Map(trendsData.trends.map(s => [s.skill.toLowerCase(), s]));
+    const trendsMap = new Map(trendItems.map(s => [s.skill.toLowerCase(), s]));
     const recommendationsMap = new Map();
 
     // --- New / Prerequisite Recommendations ---
@@ -38,9 +38,9 @@ exports.getMarketRecommendations = async (req, res) => {
       if (userSkillSet.has(skill.toLowerCase())) continue;
       const trend = trendsMap.get(skill.toLowerCase());
       if (!trend || trend.history.length < 2) continue;
-      const [prev, curr] = trend.history.slice(-2);
-      const growth = ((curr.demand_score - prev.demand_score) / prev.demand_score) * 100;
-      const relevance = parseFloat(((curr.demand_score * 0.4) + (growth * 0.6)).toFixed(2));
+      const [[, prevScore], [, currScore]] = trend.history.slice(-2);
+      const growth = ((currScore - prevScore) / prevScore) * 100;
+      const relevance = parseFloat(((currScore * 0.4) + (growth * 0.6)).toFixed(2));
       
       const prerequisites = SKILL_PREREQUISITES[skill.toLowerCase()] || [];
       const missingPrereq = prerequisites.find(pr => !userSkillSet.has(pr));
@@ -51,7 +51,7 @@ exports.getMarketRecommendations = async (req, res) => {
           recommendationsMap.set(missingPrereq, { skill: missingPrereq, type: 'prerequisite', unlocks: skill, relevance_score: relevance });
         }
       } else {
-        recommendationsMap.set(skill, { skill, type: 'new', demand_score: curr.demand_score, growth_rate: parseFloat(growth.toFixed(2)), relevance_score: relevance });
+        recommendationsMap.set(skill, { skill, type: 'new', demand_score: currScore, growth_rate: parseFloat(growth.toFixed(2)), relevance_score: relevance });
       }
     }
 
@@ -61,10 +61,10 @@ exports.getMarketRecommendations = async (req, res) => {
       if (skillObj.proficiency === 'Expert') continue;
       const trend = trendsMap.get(skillName);
       if (!trend || trend.history.length < 2) continue;
-      const [prev, curr] = trend.history.slice(-2);
-      const growth = ((curr.demand_score - prev.demand_score) / prev.demand_score) * 100;
-      const relevance = parseFloat(((curr.demand_score * 0.4) + (growth * 0.6)).toFixed(2));
-      recommendationsMap.set(skillName + '_improve', { skill: trend.skill, type: 'improve', demand_score: curr.demand_score, growth_rate: parseFloat(growth.toFixed(2)), relevance_score: relevance });
+      const [[, prevScore], [, currScore]] = trend.history.slice(-2);
+      const growth = ((currScore - prevScore) / prevScore) * 100;
+      const relevance = parseFloat(((currScore * 0.4) + (growth * 0.6)).toFixed(2));
+      recommendationsMap.set(skillName + '_improve', { skill: trend.skill, type: 'improve', demand_score: currScore, growth_rate: parseFloat(growth.toFixed(2)), relevance_score: relevance });
     }
 
     const finalRecs = Array.from(recommendationsMap.values())
@@ -0,0 +1,5 @@
+const mongoose = require('mongoose');
+const PointSchema = new mongoose.Schema({ year: { type: Number, required: true }, demand_score: { type: Number, required: true } }, { _id: false });
+const ForecastItemSchema = new mongoose.Schema({ parent_id: { type: String, required: true }, skill: { type: String, required: true }, forecast: [PointSchema] });
+ForecastItemSchema.index({ parent_id: 1, skill: 1 });
+module.exports = mongoose.model('ForecastItem', ForecastItemSchema, 'forecasts_items');
\ No newline at end of file
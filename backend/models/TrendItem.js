@@ -0,0 +1,4 @@
+const mongoose = require('mongoose');
+const TrendItemSchema = new mongoose.Schema({ parent_id: { type: String, required: true }, skill: { type: String, required: true }, history: [[Number]] });
+TrendItemSchema.index({ parent_id: 1, skill: 1 });
+module.exports = mongoose.model('TrendItem', TrendItemSchema, 'trends_items');
\ No newline at end of file
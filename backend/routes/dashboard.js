@@ -1,28 +1,26 @@
 const express = require('express');
 const router = express.Router();
 const auth = require('../middleware/authMiddleware');
-const Trend = require('../models/Trend');
-const Forecast = require('../models/Forecast');
+const TrendItem = require('../models/TrendItem');
+const ForecastItem = require('../models/ForecastItem');
 
 router.get('/trends', auth, async (req, res) => {
   try {
-    const [trendsData, forecastsData] = await Promise.all([
-      Trend.findById('skill_historical_trends'),
-      Forecast.findById('skill_forecasts')
+    const [trendItems, forecastItems] = await Promise.all([
+      TrendItem.find({ parent_id: 'skill_historical_trends' }).sort({ skill: 1 }),
+      ForecastItem.find({ parent_id: 'skill_forecasts' })
     ]);
-    
-    if (!trendsData || !forecastsData) {
+
+    if (!trendItems.length) {
       return res.status(404).json({ msg: 'Dashboard data not found.' });
     }
 
-    const combinedData = trendsData.trends.map(trend => {
-      const forecast = forecastsData.forecasts.find(f => f.skill === trend.skill);
-      return {
-        skill: trend.skill,
-        history: trend.history,
-        forecast: forecast ? forecast.forecast : []
-      };
-    });
+    const forecastsBySkill = new Map(forecastItems.map(f => [f.skill, f.forecast]));
+    const combinedData = trendItems.map(trend => ({
+      skill: trend.skill,
+      history: trend.history.map(([year, demand_score]) => ({ year, demand_score })),
+      forecast: forecastsBySkill.get(trend.skill) || []
+    }));
 
     res.json(combinedData);
   } catch (err) {